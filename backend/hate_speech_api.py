@@ -1,22 +1,32 @@
-from fastapi import FastAPI, HTTPException, Depends, status
+from fastapi import FastAPI, HTTPException, Depends, Query, status
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import ORJSONResponse, StreamingResponse
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
-from pydantic import BaseModel, EmailStr
+from pydantic import BaseModel, ConfigDict, EmailStr
 from typing import List, Dict, Any, Optional
 import logging
 import os
-import psycopg2
-from psycopg2.extras import RealDictCursor
+import asyncpg
 from dotenv import load_dotenv
+from argon2 import PasswordHasher
+from argon2.exceptions import VerifyMismatchError
 import hashlib
 import secrets
-import json
+import orjson
+
+# Let the Rust tokenizer use its thread pool for batched encodes instead
+# of emitting the fork-safety warning and going single-threaded
+os.environ.setdefault("TOKENIZERS_PARALLELISM", "true")
 import torch
 import torch.nn.functional as F
 from transformers import AutoTokenizer
 import re
-import nltk
 import sys
+import time
+import asyncio
+from collections import OrderedDict
+from contextlib import asynccontextmanager
+from datetime import datetime, timezone
 
 # Import the new LLM analyzer
 from llm_analyzer import LLMBiasAnalyzer, BiasAnalysisResponse, BiasSpan
@@ -27,71 +37,149 @@ models_dir = os.path.join(current_dir, 'bert-base-uncased-hatexplain-rationale-t
 sys.path.append(models_dir)
 from models import Model_Rational_Label
 
-# Setup NLTK data for hate speech detection
-for dataset in ['punkt', 'punkt_tab']:
-    try:
-        nltk.data.find(f'tokenizers/{dataset}')
-    except LookupError:
-        nltk.download(dataset, quiet=True)
+# This process only ever runs inference; turn autograd off globally so
+# no tensor carries gradient bookkeeping
+torch.set_grad_enabled(False)
 
 # Setup logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+@asynccontextmanager
+async def lifespan(_: FastAPI):
+    """Run startup steps concurrently; close the pool on shutdown"""
+    await asyncio.gather(_init_database(), _init_analyzers())
+    yield
+    if _micro_batch_task is not None:
+        _micro_batch_task.cancel()
+    if db_pool is not None:
+        await db_pool.close()
+
+
 app = FastAPI(
     title="Bias Detection API",
     description="API for detecting bias in text with LLM-powered analysis",
-    version="2.0.0"
+    version="2.0.0",
+    default_response_class=ORJSONResponse,
+    lifespan=lifespan
 )
 
+# Load environment variables
+load_dotenv()
+
+# Explicit origin allow-list: the wildcard + allow_credentials combo is
+# silently downgraded by starlette anyway, and a fixed list lets the
+# middleware answer preflights with a dict lookup. Browsers cache the
+# preflight for a day via max_age.
+allowed_origins = [
+    origin.strip()
+    for origin in os.getenv(
+        "ALLOWED_ORIGINS", "http://localhost:3000,http://localhost:5173"
+    ).split(",")
+    if origin.strip()
+]
+
 app.add_middleware(
     CORSMiddleware,
-    allow_origins=["*"],
+    allow_origins=allowed_origins,
+    allow_origin_regex=r"chrome-extension://.*",
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    max_age=86400,
 )
 
-# Load environment variables
-load_dotenv()
-
 # Database setup
 
-
-def get_db_connection():
-    """Get database connection"""
+# Shared connection pool created at startup; per-request TCP+TLS
+# handshakes to Supabase were the dominant cost of every DB endpoint
+db_pool: Optional[asyncpg.Pool] = None
+
+# Hot statements, defined once so the handlers and the per-connection
+# prewarm below share the exact query text (asyncpg's statement cache
+# is keyed on it)
+TOKEN_LOOKUP_SQL = "SELECT id, email, name FROM users WHERE token = $1"
+SAVE_ANALYSIS_SQL = """
+    WITH u AS (SELECT id FROM users WHERE token = $1)
+    INSERT INTO analyses (user_id, text, result, title)
+    SELECT u.id, $2, $3, $4 FROM u
+    RETURNING id
+"""
+SAVED_ANALYSES_SQL = """
+    SELECT id, user_id, text, result, title, created_at
+    FROM analyses
+    WHERE user_id = $1 AND ($2::timestamp IS NULL OR created_at < $2)
+    ORDER BY created_at DESC
+    LIMIT $3
+"""
+
+
+async def _init_db_connection(conn):
+    """Per-connection setup for pool connections"""
+    # Encode/decode jsonb at the driver boundary so handlers work with
+    # plain dicts; orjson's C encoder beats stdlib json on the nested
+    # bias-span payloads
+    await conn.set_type_codec(
+        'jsonb',
+        encoder=lambda value: orjson.dumps(value).decode(),
+        decoder=orjson.loads,
+        schema='pg_catalog'
+    )
+
+    # Pre-warm the statement cache so the first request on each fresh
+    # connection doesn't pay the parse+plan round-trip. Best-effort:
+    # on a brand-new database the tables may not exist until the
+    # migrations run just after pool creation.
     try:
-        db_url = os.getenv("SUPABASE_DATABASE_URL")
-        if not db_url:
-            raise Exception(
-                "SUPABASE_DATABASE_URL environment variable not set")
-
-        logger.info(f"Attempting to connect to database...")
-        conn = psycopg2.connect(
-            db_url,
-            cursor_factory=RealDictCursor
-        )
-        logger.info("Database connection successful")
-        return conn
-    except Exception as e:
-        logger.error(f"Database connection failed: {str(e)}")
-        raise e  # Let caller handle the exception
+        for statement in (TOKEN_LOOKUP_SQL, SAVE_ANALYSIS_SQL, SAVED_ANALYSES_SQL):
+            await conn.prepare(statement)
+    except asyncpg.PostgresError:
+        pass
+
+
+async def create_db_pool():
+    """Create the shared database connection pool"""
+    global db_pool
+    db_url = os.getenv("SUPABASE_DATABASE_URL")
+    if not db_url:
+        raise Exception(
+            "SUPABASE_DATABASE_URL environment variable not set")
+
+    logger.info("Creating database connection pool...")
+    db_pool = await asyncpg.create_pool(
+        dsn=db_url,
+        min_size=2,
+        max_size=20,
+        command_timeout=30,
+        init=_init_db_connection
+    )
+    logger.info("Database connection pool ready")
+    return db_pool
 
 # Authentication models
 
+# All request/response models are frozen: nothing mutates them after
+# construction, and the immutable config lets pydantic skip the
+# validate-on-assignment machinery
 
 class UserSignup(BaseModel):
+    model_config = ConfigDict(frozen=True)
+
     email: str
     password: str
     name: str
 
 
 class UserLogin(BaseModel):
+    model_config = ConfigDict(frozen=True)
+
     email: str
     password: str
 
 
 class AuthResponse(BaseModel):
+    model_config = ConfigDict(frozen=True)
+
     success: bool
     message: str
     user_id: Optional[int] = None
@@ -100,22 +188,17 @@ class AuthResponse(BaseModel):
 # Analysis models
 
 
-class SavedAnalysis(BaseModel):
-    id: Optional[int] = None
-    user_id: int
-    text: str
-    result: Dict[str, Any]
-    title: Optional[str] = None
-    created_at: Optional[str] = None
-
-
 class SaveAnalysisRequest(BaseModel):
+    model_config = ConfigDict(frozen=True)
+
     text: str
     result: Dict[str, Any]
     title: Optional[str] = None
 
 
 class TextInput(BaseModel):
+    model_config = ConfigDict(frozen=True)
+
     text: str
     confidence_threshold: float = 0.6
 
@@ -123,10 +206,27 @@ class TextInput(BaseModel):
 # Authentication helpers
 security = HTTPBearer()
 
+# argon2id with moderate parameters; the encoded hash carries its own
+# salt and parameters so it fits the existing password_hash column
+password_hasher = PasswordHasher(time_cost=2, memory_cost=64 * 1024, parallelism=2)
+
 
 def hash_password(password: str) -> str:
-    """Simple password hashing"""
-    return hashlib.sha256(password.encode()).hexdigest()
+    """Hash a password with argon2id"""
+    return password_hasher.hash(password)
+
+
+def verify_password(stored_hash: str, password: str) -> bool:
+    """Verify a password against a stored argon2 (or legacy sha256) hash"""
+    if stored_hash.startswith("$argon2"):
+        try:
+            password_hasher.verify(stored_hash, password)
+            return True
+        except VerifyMismatchError:
+            return False
+    # Legacy unsalted sha256 hashes from before the argon2 migration
+    return secrets.compare_digest(
+        stored_hash, hashlib.sha256(password.encode()).hexdigest())
 
 
 def generate_token() -> str:
@@ -134,147 +234,339 @@ def generate_token() -> str:
     return secrets.token_urlsafe(32)
 
 
-def create_user_table():
-    """Create users table if it doesn't exist"""
-    try:
-        conn = get_db_connection()
-        cursor = conn.cursor()
-        cursor.execute("""
-            CREATE TABLE IF NOT EXISTS users (
-                id SERIAL PRIMARY KEY,
-                email VARCHAR(255) UNIQUE NOT NULL,
-                name VARCHAR(255) NOT NULL,
-                password_hash VARCHAR(255) NOT NULL,
-                token VARCHAR(255),
-                created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
-            )
-        """)
-        conn.commit()
-        cursor.close()
-        conn.close()
-        logger.info("Users table created/verified successfully")
-        return True
-    except Exception as e:
-        logger.error(f"Failed to create users table: {e}")
-        return False
+MIGRATIONS_DIR = os.path.join(current_dir, 'migrations')
+
 
+async def apply_migrations():
+    """Apply the SQL files in migrations/ in filename order
 
-def create_analyses_table():
-    """Create analyses table if it doesn't exist"""
+    All DDL lives in the migration files (each idempotent), so each
+    file goes to Postgres as one multi-statement round-trip instead of
+    per-table executes scattered through the code.
+    """
     try:
-        conn = get_db_connection()
-        cursor = conn.cursor()
-        cursor.execute("""
-            CREATE TABLE IF NOT EXISTS analyses (
-                id SERIAL PRIMARY KEY,
-                user_id INTEGER REFERENCES users(id) ON DELETE CASCADE,
-                text TEXT NOT NULL,
-                result JSONB NOT NULL,
-                title VARCHAR(255),
-                created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
-            )
-        """)
-        conn.commit()
-        cursor.close()
-        conn.close()
-        logger.info("Analyses table created/verified successfully")
+        async with db_pool.acquire() as conn:
+            for filename in sorted(os.listdir(MIGRATIONS_DIR)):
+                if not filename.endswith('.sql'):
+                    continue
+                with open(os.path.join(MIGRATIONS_DIR, filename)) as f:
+                    await conn.execute(f.read())
+                logger.info(f"Applied migration {filename}")
         return True
     except Exception as e:
-        logger.error(f"Failed to create analyses table: {e}")
+        logger.error(f"Failed to apply migrations: {e}")
         return False
 
 
-def get_user_from_token(token: str) -> Optional[Dict]:
-    """Get user information from token"""
+# Token -> (user dict, expiry) cache so authenticated endpoints skip the
+# auth round-trip for recently seen tokens
+_token_cache: Dict[str, tuple] = {}
+_TOKEN_CACHE_TTL_S = 300
+_TOKEN_CACHE_MAX = 10000
+
+
+async def get_user_from_token(token: str, conn: Optional[asyncpg.Connection] = None) -> Optional[Dict]:
+    """Get user information from token, reusing a connection if given"""
+    cached = _token_cache.get(token)
+    if cached and cached[1] > time.monotonic():
+        return dict(cached[0])
+
     try:
-        conn = get_db_connection()
-        cursor = conn.cursor()
-        cursor.execute(
-            "SELECT id, email, name FROM users WHERE token = %s", (token,))
-        user = cursor.fetchone()
-        cursor.close()
-        conn.close()
-        return dict(user) if user else None
+        if conn is not None:
+            user = await conn.fetchrow(TOKEN_LOOKUP_SQL, token)
+        else:
+            async with db_pool.acquire() as pooled:
+                user = await pooled.fetchrow(TOKEN_LOOKUP_SQL, token)
+
+        if not user:
+            return None
+
+        if len(_token_cache) >= _TOKEN_CACHE_MAX:
+            # Drop expired entries; if everything is live, drop the oldest
+            now = time.monotonic()
+            for key in [k for k, v in _token_cache.items() if v[1] <= now]:
+                del _token_cache[key]
+            if len(_token_cache) >= _TOKEN_CACHE_MAX:
+                del _token_cache[next(iter(_token_cache))]
+        _token_cache[token] = (dict(user), time.monotonic() + _TOKEN_CACHE_TTL_S)
+
+        return dict(user)
     except Exception as e:
         logger.error(f"Error getting user from token: {e}")
         return None
 
 
 # Hate speech analysis helpers
+
+# Single alternation covering all clause boundaries so each sentence is
+# split in one C-level regex pass instead of 13 sequential re.split calls
+CLAUSE_SPLIT_RE = re.compile(
+    r',\s+(?=\w)|;\s*|\s+(?:and|but|or|because|since|while|when|if|although|however|therefore)\s+'
+)
+
+# Sentence boundaries: terminal punctuation followed by whitespace and a
+# capital. Short user text doesn't need Punkt's abbreviation model, and
+# dropping it removes the punkt download and pickle load entirely.
+SENTENCE_SPLIT_RE = re.compile(r'(?<=[.!?])\s+(?=[A-Z])')
+
+
 def split_text_into_clauses(text: str) -> List[str]:
     """Split text into sentences and clauses for analysis"""
-    sentences = nltk.sent_tokenize(text)
-    
     clauses = []
-    clause_patterns = [
-        r',\s+(?=\w)', r';\s*', r'\s+and\s+', r'\s+but\s+', r'\s+or\s+',
-        r'\s+because\s+', r'\s+since\s+', r'\s+while\s+', r'\s+when\s+',
-        r'\s+if\s+', r'\s+although\s+', r'\s+however\s+', r'\s+therefore\s+'
-    ]
-    
-    for sentence in sentences:
-        current_clauses = [sentence]
-        for pattern in clause_patterns:
-            new_clauses = []
-            for clause in current_clauses:
-                split_clauses = re.split(pattern, clause)
-                new_clauses.extend([c.strip() for c in split_clauses if c.strip()])
-            current_clauses = new_clauses
-        clauses.extend(current_clauses)
-    
-    return [clause for clause in clauses if len(clause.split()) >= 3]
+    for sentence in SENTENCE_SPLIT_RE.split(text):
+        for part in CLAUSE_SPLIT_RE.split(sentence):
+            clause = part.strip()
+            # Keep clauses of at least 3 words; split() collapses runs
+            # of whitespace, which a raw space count would miscount
+            if len(clause.split()) >= 3:
+                clauses.append(clause)
+    return clauses
 
 
-def analyze_clause_for_hate_speech(clause: str, confidence_threshold: float = 0.6) -> Dict[str, Any]:
-    """Analyze a single clause for hate speech"""
+# Cache of clause -> (predicted_class, confidence, hate_speech_probability).
+# Raw scores don't depend on the confidence threshold, so cached clauses
+# skip tokenization and the forward pass entirely; only misses are batched.
+_clause_score_cache: "OrderedDict[str, tuple]" = OrderedDict()
+_CLAUSE_SCORE_CACHE_MAX = 2048
+
+# Largest mini-batch fed to the model in one forward pass
+_SCORE_BATCH_SIZE = 32
+
+# Padded sequence lengths are rounded up to one of these buckets so the
+# model only ever sees a few static shapes
+_PAD_BUCKETS = (32, 64, 128, 256, 512)
+
+
+def _score_clauses(clauses: List[str]) -> List[tuple]:
+    """Score clauses with the model, reusing cached scores for repeats"""
     global hate_speech_tokenizer, hate_speech_model
-    
+
+    # Snapshot cache hits into a local map (touching their LRU position)
+    # before any miss is inserted, so evictions triggered by this call's
+    # own inserts can never drop a score the call still needs
+    scores_by_clause: Dict[str, tuple] = {}
+    for clause in clauses:
+        cached = _clause_score_cache.get(clause)
+        if cached is not None:
+            _clause_score_cache.move_to_end(clause)
+            scores_by_clause[clause] = cached
+
+    misses = [c for c in dict.fromkeys(clauses) if c not in scores_by_clause]
+
+    if misses:
+        # Tokenize once without padding, then score in length-sorted
+        # mini-batches so a short clause is only padded to the longest
+        # clause in its own bucket, not the longest in the request
+        encoded = hate_speech_tokenizer(misses, truncation=True, max_length=512)
+        order = sorted(range(len(misses)), key=lambda i: len(encoded['input_ids'][i]))
+
+        for start in range(0, len(order), _SCORE_BATCH_SIZE):
+            batch_indices = order[start:start + _SCORE_BATCH_SIZE]
+            # Round the padded length up to a fixed bucket so batches hit
+            # a handful of static shapes, letting cuDNN autotune, the
+            # TorchScript cache and ONNX Runtime reuse plans across calls
+            max_len = max(len(encoded['input_ids'][i]) for i in batch_indices)
+            target_len = next((b for b in _PAD_BUCKETS if b >= max_len), 512)
+            batch = hate_speech_tokenizer.pad(
+                {
+                    'input_ids': [encoded['input_ids'][i] for i in batch_indices],
+                    'attention_mask': [encoded['attention_mask'][i] for i in batch_indices]
+                },
+                padding='max_length',
+                max_length=target_len,
+                return_tensors="pt"
+            )
+
+            if hate_speech_onnx_session is not None:
+                outputs = hate_speech_onnx_session.run(None, {
+                    'input_ids': batch['input_ids'].numpy(),
+                    'attention_mask': batch['attention_mask'].numpy()
+                })
+                classification_logits = torch.from_numpy(outputs[0])
+            else:
+                input_ids = batch['input_ids']
+                attention_mask = batch['attention_mask']
+                if hate_speech_device.type == "cuda":
+                    # Stage through pinned memory so the host-to-device copy
+                    # is async and overlaps with compute
+                    input_ids = input_ids.pin_memory().to(hate_speech_device, non_blocking=True)
+                    attention_mask = attention_mask.pin_memory().to(hate_speech_device, non_blocking=True)
+
+                with torch.inference_mode():
+                    classification_logits, token_logits = hate_speech_model(
+                        input_ids=input_ids,
+                        attention_mask=attention_mask
+                    )
+
+            # Softmax in float32 to avoid fp16 numerical issues on GPU
+            classification_probs = F.softmax(classification_logits.float(), dim=-1)
+
+            # One softmax and one device sync per batch; the two-class
+            # argmax is a plain comparison on the transferred floats, so
+            # no separate argmax kernel or extra sync is needed
+            probs_list = classification_probs.tolist()
+
+            for i, probs in zip(batch_indices, probs_list):
+                predicted_class = 0 if probs[0] >= probs[1] else 1
+                score = (predicted_class, probs[predicted_class], probs[1])
+                scores_by_clause[misses[i]] = score
+                _clause_score_cache[misses[i]] = score
+                if len(_clause_score_cache) > _CLAUSE_SCORE_CACHE_MAX:
+                    _clause_score_cache.popitem(last=False)
+
+    return [scores_by_clause[clause] for clause in clauses]
+
+
+def _build_clause_analysis(clause: str, score: tuple, confidence_threshold: float) -> Dict[str, Any]:
+    """Turn a raw model score into the per-clause analysis dict"""
+    predicted_class, confidence, hate_speech_probability = score
+    is_hate_speech = predicted_class == 1 and hate_speech_probability >= confidence_threshold
+
+    justification = generate_hate_speech_justification(
+        clause, is_hate_speech, confidence
+    )
+
+    return {
+        'clause': clause,
+        'is_hate_speech': is_hate_speech,
+        'confidence': confidence,
+        'hate_speech_probability': hate_speech_probability,
+        'justification': justification
+    }
+
+
+def _model_unavailable_analyses(clauses: List[str], message: str) -> List[Dict[str, Any]]:
+    """Placeholder analyses for when the model can't score the clauses"""
+    return [{
+        'clause': clause,
+        'is_hate_speech': False,
+        'confidence': 0.0,
+        'hate_speech_probability': 0.0,
+        'justification': message
+    } for clause in clauses]
+
+
+def analyze_clauses_for_hate_speech(clauses: List[str], confidence_threshold: float = 0.6) -> List[Dict[str, Any]]:
+    """Analyze a batch of clauses for hate speech with a single model forward pass"""
+    global hate_speech_tokenizer, hate_speech_model
+
+    if not clauses:
+        return []
+
     if not hate_speech_tokenizer or not hate_speech_model:
-        return {
-            'clause': clause,
-            'is_hate_speech': False,
-            'confidence': 0.0,
-            'hate_speech_probability': 0.0,
-            'justification': "Hate speech model not loaded"
-        }
-    
+        return _model_unavailable_analyses(clauses, "Hate speech model not loaded")
+
     try:
-        inputs = hate_speech_tokenizer(clause, return_tensors="pt", truncation=True, max_length=512)
-        
-        with torch.no_grad():
-            classification_logits, token_logits = hate_speech_model(
-                input_ids=inputs['input_ids'], 
-                attention_mask=inputs['attention_mask']
+        scores = _score_clauses(clauses)
+        return [
+            _build_clause_analysis(clause, score, confidence_threshold)
+            for clause, score in zip(clauses, scores)
+        ]
+    except Exception as e:
+        logger.error(f"Error analyzing clauses: {e}")
+        return _model_unavailable_analyses(clauses, f"Error during analysis: {str(e)}")
+
+
+# Micro-batching scheduler: clauses from concurrent requests are funneled
+# through one queue, and a background task coalesces whatever arrives
+# within a short window into a single forward pass
+_MICRO_BATCH_MAX = 32
+_MICRO_BATCH_WAIT_S = 0.01
+_micro_batch_queue: Optional["asyncio.Queue"] = None
+
+# Strong reference to the worker task: the event loop only keeps a weak
+# one, so without this the worker could be garbage collected mid-flight
+_micro_batch_task: Optional["asyncio.Task"] = None
+
+
+async def _micro_batch_worker():
+    """Drain the clause queue and score coalesced batches"""
+    loop = asyncio.get_running_loop()
+    while True:
+        batch = [await _micro_batch_queue.get()]
+        deadline = loop.time() + _MICRO_BATCH_WAIT_S
+        while len(batch) < _MICRO_BATCH_MAX:
+            timeout = deadline - loop.time()
+            if timeout <= 0:
+                break
+            try:
+                batch.append(await asyncio.wait_for(_micro_batch_queue.get(), timeout))
+            except asyncio.TimeoutError:
+                break
+
+        try:
+            # Run the blocking forward pass off the event loop so new
+            # requests can keep queueing clauses while the model works
+            scores = await asyncio.to_thread(
+                _score_clauses, [clause for clause, _ in batch]
             )
-        
-        classification_probs = F.softmax(classification_logits, dim=-1)
-        predicted_class = torch.argmax(classification_logits, dim=-1)
-        confidence = classification_probs[0][predicted_class].item()
-        hate_speech_probability = classification_probs[0][1].item()
-        
-        is_hate_speech = predicted_class.item() == 1 and hate_speech_probability >= confidence_threshold
-        
-        justification = generate_hate_speech_justification(
-            clause, is_hate_speech, confidence
-        )
-        
-        return {
-            'clause': clause,
-            'is_hate_speech': is_hate_speech,
-            'confidence': confidence,
-            'hate_speech_probability': hate_speech_probability,
-            'justification': justification
-        }
-        
+        except Exception as e:
+            for _, future in batch:
+                if not future.done():
+                    future.set_exception(e)
+            continue
+
+        for (_, future), score in zip(batch, scores):
+            if not future.done():
+                future.set_result(score)
+
+
+async def analyze_clauses_for_hate_speech_async(clauses: List[str], confidence_threshold: float = 0.6) -> List[Dict[str, Any]]:
+    """Async variant that shares batches with other in-flight requests"""
+    global hate_speech_tokenizer, hate_speech_model
+
+    if not clauses:
+        return []
+
+    if not hate_speech_tokenizer or not hate_speech_model:
+        return _model_unavailable_analyses(clauses, "Hate speech model not loaded")
+
+    if _micro_batch_queue is None:
+        return analyze_clauses_for_hate_speech(clauses, confidence_threshold)
+
+    try:
+        loop = asyncio.get_running_loop()
+        futures = []
+        for clause in clauses:
+            future = loop.create_future()
+            _micro_batch_queue.put_nowait((clause, future))
+            futures.append(future)
+        scores = await asyncio.gather(*futures)
+
+        return [
+            _build_clause_analysis(clause, score, confidence_threshold)
+            for clause, score in zip(clauses, scores)
+        ]
     except Exception as e:
-        logger.error(f"Error analyzing clause '{clause}': {e}")
-        return {
-            'clause': clause,
-            'is_hate_speech': False,
-            'confidence': 0.0,
-            'hate_speech_probability': 0.0,
-            'justification': f"Error during analysis: {str(e)}"
-        }
+        logger.error(f"Error analyzing clauses: {e}")
+        return _model_unavailable_analyses(clauses, f"Error during analysis: {str(e)}")
+
+
+def analyze_clause_for_hate_speech(clause: str, confidence_threshold: float = 0.6) -> Dict[str, Any]:
+    """Analyze a single clause for hate speech"""
+    return analyze_clauses_for_hate_speech([clause], confidence_threshold)[0]
+
+
+# Concerning keywords compiled into one alternation so each clause is
+# scanned in a single linear regex pass instead of ~30 substring searches
+CONCERNING_PATTERNS = {
+    'racial': ['black', 'white', 'asian', 'hispanic', 'race', 'color', 'brown'],
+    'religious': ['muslim', 'christian', 'jewish', 'religion', 'faith'],
+    'gender': ['woman', 'man', 'female', 'male', 'gender', 'women', 'bitch'],
+    'sexual_orientation': ['gay', 'lesbian', 'homosexual', 'straight'],
+    'general_offensive': ['hate', 'kill', 'die', 'stupid', 'idiot']
+}
+
+_KEYWORD_TO_CATEGORY = {
+    keyword: category
+    for category, keywords in CONCERNING_PATTERNS.items()
+    for keyword in keywords
+}
+
+# Longest keywords first so overlapping matches prefer the longer word
+_KEYWORD_RE = re.compile(
+    '|'.join(sorted((re.escape(k) for k in _KEYWORD_TO_CATEGORY), key=len, reverse=True))
+)
 
 
 def generate_hate_speech_justification(clause: str, is_hate_speech: bool, confidence: float) -> str:
@@ -284,34 +576,28 @@ def generate_hate_speech_justification(clause: str, is_hate_speech: bool, confid
             return "This text appears to be neutral or positive with no indicators of hate speech."
         else:
             return f"While some words might seem concerning, the overall context suggests this is not hate speech (confidence: {confidence:.2f})."
-    
+
     justifications = []
-    
+
     if confidence > 0.8:
         justifications.append("High confidence prediction based on language patterns associated with hate speech.")
     elif confidence > 0.6:
         justifications.append("Moderate confidence - some indicators of potentially harmful language.")
     else:
         justifications.append("Low confidence - borderline case that may require human review.")
-    
-    concerning_patterns = {
-        'racial': ['black', 'white', 'asian', 'hispanic', 'race', 'color', 'brown'],
-        'religious': ['muslim', 'christian', 'jewish', 'religion', 'faith'],
-        'gender': ['woman', 'man', 'female', 'male', 'gender', 'women', 'bitch'],
-        'sexual_orientation': ['gay', 'lesbian', 'homosexual', 'straight'],
-        'general_offensive': ['hate', 'kill', 'die', 'stupid', 'idiot']
+
+    matched_categories = {
+        _KEYWORD_TO_CATEGORY[match] for match in _KEYWORD_RE.findall(clause.lower())
     }
-    
-    detected_categories = []
-    clause_lower = clause.lower()
-    
-    for category, keywords in concerning_patterns.items():
-        if any(keyword in clause_lower for keyword in keywords):
-            detected_categories.append(category.replace('_', ' '))
-    
+    detected_categories = [
+        category.replace('_', ' ')
+        for category in CONCERNING_PATTERNS
+        if category in matched_categories
+    ]
+
     if detected_categories:
         justifications.append(f"Potentially targets: {', '.join(detected_categories)}")
-    
+
     return " ".join(justifications)
 
 
@@ -319,35 +605,151 @@ def generate_hate_speech_justification(clause: str, is_hate_speech: bool, confid
 analyzer = None
 hate_speech_tokenizer = None
 hate_speech_model = None
+hate_speech_device = torch.device("cpu")
+hate_speech_onnx_session = None
 
 
-@app.on_event("startup")
-async def startup_event():
-    """Initialize services on startup"""
-    global analyzer, hate_speech_tokenizer, hate_speech_model
+async def _init_database():
+    """Create the connection pool and verify the schema"""
     try:
-        logger.info("Creating database tables...")
-        user_table_status = create_user_table()
-        analyses_table_status = create_analyses_table()
-        if user_table_status and analyses_table_status:
-            logger.info("Database initialization successful")
-        else:
-            logger.warning(
-                "Database initialization failed - some endpoints may not work")
+        await create_db_pool()
+    except Exception as e:
+        # Keep serving the analysis endpoints without a database; only
+        # the endpoints that actually touch the pool will fail
+        logger.warning(
+            f"Database initialization failed - some endpoints may not work: {e}")
+        return
+
+    logger.info("Applying database migrations...")
+    if await apply_migrations():
+        logger.info("Database initialization successful")
+    else:
+        logger.warning(
+            "Database initialization failed - some endpoints may not work")
 
-        logger.info("Initializing LLM bias analyzer...")
-        analyzer = LLMBiasAnalyzer()
-        logger.info("Bias analyzer initialized successfully!")
-        
+
+def _load_hate_speech_model():
+    """Load, optimize and prewarm the hate speech model (blocking)"""
+    global hate_speech_tokenizer, hate_speech_model, hate_speech_device, hate_speech_onnx_session
+    try:
         logger.info("Loading hate speech detection model...")
-        hate_speech_tokenizer = AutoTokenizer.from_pretrained("Hate-speech-CNERG/bert-base-uncased-hatexplain-rationale-two")
-        hate_speech_model = Model_Rational_Label.from_pretrained("Hate-speech-CNERG/bert-base-uncased-hatexplain-rationale-two")
+        # Overridable so a smaller distilled checkpoint with the same
+        # head shape can be swapped in without a code change
+        model_name = os.getenv(
+            "HATE_SPEECH_MODEL",
+            "Hate-speech-CNERG/bert-base-uncased-hatexplain-rationale-two"
+        )
+        hate_speech_tokenizer = AutoTokenizer.from_pretrained(
+            model_name, use_fast=True
+        )
+        # Prefer the fused scaled-dot-product-attention kernel; older
+        # transformers (or the custom model class) may not accept the
+        # kwarg, in which case fall back to the default eager attention
+        try:
+            hate_speech_model = Model_Rational_Label.from_pretrained(
+                model_name, attn_implementation="sdpa"
+            )
+        except (TypeError, ValueError):
+            hate_speech_model = Model_Rational_Label.from_pretrained(model_name)
         hate_speech_model.eval()
-        logger.info("Hate speech model loaded successfully!")
+        for param in hate_speech_model.parameters():
+            param.requires_grad_(False)
+
+        if torch.cuda.is_available():
+            # Padded batch shapes are stable, so let cuDNN autotune kernels
+            torch.backends.cudnn.benchmark = True
+            # Half precision on GPU halves bandwidth and roughly doubles
+            # matmul throughput; BERT-class models tolerate fp16 inference
+            hate_speech_device = torch.device("cuda")
+            hate_speech_model = hate_speech_model.to(hate_speech_device, dtype=torch.float16)
+        else:
+            # Quantize nn.Linear layers to int8 for faster CPU inference.
+            # The FP32 weights on disk are untouched; only the in-memory
+            # module is quantized.
+            try:
+                torch.set_num_threads(os.cpu_count() or 1)
+                torch.set_num_interop_threads(1)
+            except RuntimeError:
+                # Thread settings can only be changed before parallel work
+                # starts; ignore if it's too late (e.g. on --reload)
+                pass
+            hate_speech_model = torch.quantization.quantize_dynamic(
+                hate_speech_model, {torch.nn.Linear}, dtype=torch.qint8
+            )
+
+        # TorchScript-trace and freeze the quantized model to fuse
+        # elementwise ops and cut per-layer Python dispatch overhead.
+        # Fall back to the eager module if tracing fails.
+        try:
+            example = hate_speech_tokenizer(
+                ["hello world", "another example"],
+                return_tensors="pt", padding=True, truncation=True, max_length=128
+            )
+            # The example tensors must live on the model's device; on
+            # GPU deployments the model is already on CUDA by now
+            traced = torch.jit.trace(
+                hate_speech_model,
+                (example['input_ids'].to(hate_speech_device),
+                 example['attention_mask'].to(hate_speech_device)),
+                strict=False
+            )
+            traced = torch.jit.freeze(traced)
+            hate_speech_model = torch.jit.optimize_for_inference(traced)
+            logger.info("Hate speech model traced and frozen with TorchScript")
+        except Exception as jit_error:
+            logger.warning(f"TorchScript tracing failed, using eager model: {jit_error}")
+
+        # Scores cached against a previous model instance are stale
+        _clause_score_cache.clear()
+
+        # Optional ONNX Runtime path for CPU serving. Export offline with
+        #   optimum-cli export onnx --model Hate-speech-CNERG/bert-base-uncased-hatexplain-rationale-two --task text-classification onnx/
+        #   python -m onnxruntime.quantization.quantize_dynamic onnx/model.onnx onnx/model.int8.onnx
+        # then point HATE_SPEECH_ONNX_MODEL at the quantized file.
+        onnx_path = os.getenv("HATE_SPEECH_ONNX_MODEL")
+        if onnx_path:
+            try:
+                import onnxruntime as ort
+                session_options = ort.SessionOptions()
+                session_options.intra_op_num_threads = os.cpu_count() or 1
+                hate_speech_onnx_session = ort.InferenceSession(
+                    onnx_path,
+                    providers=["CPUExecutionProvider"],
+                    sess_options=session_options
+                )
+                logger.info(f"Serving hate speech model via ONNX Runtime: {onnx_path}")
+            except Exception as onnx_error:
+                logger.warning(f"Could not load ONNX model, using PyTorch: {onnx_error}")
+
+        # Prewarm: run one dummy batch so kernel autotuning, JIT warmup
+        # and tokenizer setup happen before the first real request
+        _score_clauses(["warm up the model before serving requests"])
+        _clause_score_cache.clear()
+
+        logger.info("Hate speech model loaded and ready!")
     except Exception as e:
         logger.error(f"Failed to initialize services: {e}")
         raise RuntimeError(f"Failed to initialize services: {e}")
 
+
+async def _init_analyzers():
+    """Initialize the LLM analyzer and the local model off the event loop"""
+    global analyzer, _micro_batch_queue, _micro_batch_task
+
+    logger.info("Initializing LLM bias analyzer...")
+    analyzer = LLMBiasAnalyzer()
+    logger.info("Bias analyzer initialized successfully!")
+
+    # The model load is blocking CPU work; run it in a thread so it
+    # overlaps with database initialization
+    await asyncio.to_thread(_load_hate_speech_model)
+
+    # Start the micro-batching worker so concurrent requests share
+    # model batches
+    _micro_batch_queue = asyncio.Queue()
+    _micro_batch_task = asyncio.create_task(_micro_batch_worker())
+
+
 # Authentication endpoints
 
 
@@ -355,30 +757,23 @@ async def startup_event():
 async def signup(user_data: UserSignup):
     """Sign up a new user"""
     try:
-        conn = get_db_connection()
-        cursor = conn.cursor()
-
-        # Check if user already exists
-        cursor.execute("SELECT id FROM users WHERE email = %s",
-                       (user_data.email,))
-        if cursor.fetchone():
-            cursor.close()
-            conn.close()
-            return AuthResponse(success=False, message="User already exists")
-
-        # Create new user
-        password_hash = hash_password(user_data.password)
+        # Argon2 hashing is deliberately expensive CPU work; run it in a
+        # thread so it doesn't stall the event loop
+        password_hash = await asyncio.to_thread(hash_password, user_data.password)
         token = generate_token()
 
-        cursor.execute("""
-            INSERT INTO users (email, name, password_hash, token)
-            VALUES (%s, %s, %s, %s) RETURNING id
-        """, (user_data.email, user_data.name, password_hash, token))
-
-        user_id = cursor.fetchone()['id']
-        conn.commit()
-        cursor.close()
-        conn.close()
+        # Single atomic round-trip: the UNIQUE constraint on email does
+        # the existence check, with no SELECT-then-INSERT race
+        async with db_pool.acquire() as conn:
+            user_id = await conn.fetchval("""
+                INSERT INTO users (email, name, password_hash, token)
+                VALUES ($1, $2, $3, $4)
+                ON CONFLICT (email) DO NOTHING
+                RETURNING id
+            """, user_data.email, user_data.name, password_hash, token)
+
+        if user_id is None:
+            return AuthResponse(success=False, message="User already exists")
 
         return AuthResponse(
             success=True,
@@ -396,19 +791,29 @@ async def signup(user_data: UserSignup):
 async def login(user_data: UserLogin):
     """Login user"""
     try:
-        conn = get_db_connection()
-        cursor = conn.cursor()
-
-        # Check user credentials
-        password_hash = hash_password(user_data.password)
-        cursor.execute("""
-            SELECT id, token FROM users 
-            WHERE email = %s AND password_hash = %s
-        """, (user_data.email, password_hash))
-
-        user = cursor.fetchone()
-        cursor.close()
-        conn.close()
+        # Fetch by email only and verify the hash in Python; argon2
+        # hashes are salted so no equality match in SQL is possible.
+        # Release the connection before hashing so the deliberately
+        # slow argon2 work doesn't hold a pool slot hostage.
+        async with db_pool.acquire() as conn:
+            user = await conn.fetchrow("""
+                SELECT id, token, password_hash FROM users
+                WHERE email = $1
+            """, user_data.email)
+
+        # Verification is expensive by design (argon2); keep it off
+        # the event loop
+        if user and not await asyncio.to_thread(
+                verify_password, user['password_hash'], user_data.password):
+            user = None
+
+        if user and not user['password_hash'].startswith("$argon2"):
+            # Transparently upgrade legacy sha256 hashes on login
+            new_hash = await asyncio.to_thread(hash_password, user_data.password)
+            async with db_pool.acquire() as conn:
+                await conn.execute(
+                    "UPDATE users SET password_hash = $1 WHERE id = $2",
+                    new_hash, user['id'])
 
         if user:
             return AuthResponse(
@@ -437,33 +842,78 @@ async def root():
     }
 
 
-@app.post("/analyze", response_model=BiasAnalysisResponse)
-async def analyze_text_for_bias(input_data: TextInput):
-    """Analyze text for bias using LLM"""
+async def run_bias_analysis(text: str) -> BiasAnalysisResponse:
+    """Core LLM bias analysis shared by the bias endpoints"""
     if not analyzer:
         raise HTTPException(
             status_code=500, detail="Bias analyzer not initialized")
 
-    try:
-        text = input_data.text.strip()
-        if not text:
-            raise HTTPException(status_code=400, detail="Text cannot be empty")
-
-        # Analyze text using LLM
-        result = await analyzer.analyze_text(text)
-        return result
+    text = text.strip()
+    if not text:
+        raise HTTPException(status_code=400, detail="Text cannot be empty")
 
+    try:
+        return await analyzer.analyze_text(text)
     except Exception as e:
         logger.error(f"Error during bias analysis: {e}")
         raise HTTPException(
             status_code=500, detail=f"Bias analysis failed: {str(e)}")
 
 
+@app.post("/analyze")
+async def analyze_text_for_bias(input_data: TextInput):
+    """Analyze text for bias using LLM"""
+    return await run_bias_analysis(input_data.text)
+
+
+@app.post("/analyze-stream")
+async def analyze_stream(input_data: TextInput):
+    """Stream bias spans as NDJSON while the analysis is still running"""
+    if not analyzer:
+        raise HTTPException(
+            status_code=500, detail="Bias analyzer not initialized")
+
+    text = input_data.text.strip()
+    if not text:
+        raise HTTPException(status_code=400, detail="Text cannot be empty")
+
+    async def span_records():
+        async for record in analyzer.analyze_text_stream(text):
+            yield orjson.dumps(record) + b"\n"
+
+    return StreamingResponse(span_records(), media_type="application/x-ndjson")
+
+
+@app.post("/analyze-batch")
+async def analyze_batch(items: List[TextInput]):
+    """Analyze several texts in one request with concurrent LLM calls"""
+    if len(items) > 32:
+        raise HTTPException(
+            status_code=400, detail="Batch size is limited to 32 texts")
+
+    results = await asyncio.gather(
+        *[run_bias_analysis(item.text) for item in items],
+        return_exceptions=True
+    )
+
+    # Map per-item failures to error records so one bad text doesn't
+    # fail the whole batch and order is preserved
+    responses = []
+    for result in results:
+        if isinstance(result, HTTPException):
+            responses.append({"error": result.detail})
+        elif isinstance(result, Exception):
+            responses.append({"error": str(result)})
+        else:
+            responses.append(result)
+    return responses
+
+
 @app.post("/analyze-simple")
 async def analyze_simple(input_data: TextInput):
     """Simplified endpoint that returns bias spans in a simplified format"""
     try:
-        result = await analyze_text_for_bias(input_data)
+        result = await run_bias_analysis(input_data.text)
 
         return {
             "bias_detected": len(result.bias_spans) > 0,
@@ -507,9 +957,11 @@ async def analyze_hate_speech(input_data: TextInput):
 
         hate_speech_clauses = []
 
-        for clause in clauses:
-            analysis = analyze_clause_for_hate_speech(clause, confidence_threshold)
-            
+        # Batched through the shared micro-batching queue so concurrent
+        # requests coalesce into single forward passes
+        analyses = await analyze_clauses_for_hate_speech_async(clauses, confidence_threshold)
+
+        for analysis in analyses:
             if analysis['is_hate_speech']:
                 hate_speech_clauses.append({
                     "text": analysis['clause'],
@@ -551,23 +1003,14 @@ async def analyze_hate_speech(input_data: TextInput):
 async def save_analysis(analysis_data: SaveAnalysisRequest, user: HTTPAuthorizationCredentials = Depends(security)):
     """Save an analysis result to the database"""
     try:
-        # Get user from token
-        user_data = get_user_from_token(user.credentials)
-        if not user_data:
-            return AuthResponse(success=False, message="Invalid token")
-
-        conn = get_db_connection()
-        cursor = conn.cursor()
+        # Token lookup and insert in one statement on one connection
+        async with db_pool.acquire() as conn:
+            analysis_id = await conn.fetchval(
+                SAVE_ANALYSIS_SQL,
+                user.credentials, analysis_data.text, analysis_data.result, analysis_data.title)
 
-        cursor.execute("""
-            INSERT INTO analyses (user_id, text, result, title)
-            VALUES (%s, %s, %s, %s) RETURNING id
-        """, (user_data['id'], analysis_data.text, json.dumps(analysis_data.result), analysis_data.title))
-
-        analysis_id = cursor.fetchone()['id']
-        conn.commit()
-        cursor.close()
-        conn.close()
+        if analysis_id is None:
+            return AuthResponse(success=False, message="Invalid token")
 
         return AuthResponse(
             success=True,
@@ -580,77 +1023,91 @@ async def save_analysis(analysis_data: SaveAnalysisRequest, user: HTTPAuthorizat
         return AuthResponse(success=False, message="Database connection failed - save unavailable")
 
 
-@app.get("/saved-analyses", response_model=List[SavedAnalysis])
-async def get_saved_analyses(user: HTTPAuthorizationCredentials = Depends(security)):
-    """Get all saved analyses for the authenticated user"""
+@app.get("/saved-analyses")
+async def get_saved_analyses(
+    limit: int = Query(50, ge=1, le=200),
+    before: Optional[datetime] = None,
+    user: HTTPAuthorizationCredentials = Depends(security)
+):
+    """Stream a keyset-paginated page of the user's saved analyses as NDJSON
+
+    Pass the created_at of the last received row as `before` to fetch
+    the next page; with the (user_id, created_at DESC) index each page
+    is an index range scan of at most `limit` rows.
+    """
+    user_data = await get_user_from_token(user.credentials)
+    if not user_data:
+        raise HTTPException(status_code=401, detail="Invalid token")
+
+    # created_at is a naive TIMESTAMP column; a tz-aware cursor (e.g.
+    # a trailing Z from toISOString) would make asyncpg raise mid-stream
+    # and silently truncate the page, so normalize to naive UTC here
+    if before is not None and before.tzinfo is not None:
+        before = before.astimezone(timezone.utc).replace(tzinfo=None)
+
+    async def row_stream():
+        try:
+            async with db_pool.acquire() as conn:
+                # A server-side cursor keeps memory flat no matter how
+                # many analyses the user has, and the first row reaches
+                # the client before the last one is read
+                async with conn.transaction():
+                    async for row in conn.cursor(SAVED_ANALYSES_SQL, user_data['id'], before, limit):
+                        record = dict(row)
+                        if record['created_at']:
+                            record['created_at'] = record['created_at'].isoformat()
+                        yield orjson.dumps(record) + b"\n"
+        except Exception as e:
+            logger.error(f"Get saved analyses error: {e}")
+            # Re-raise so the chunked body is aborted: a clean end of
+            # stream here would be indistinguishable from a genuine end
+            # of data and make paginating clients stop early
+            raise
+
+    return StreamingResponse(row_stream(), media_type="application/x-ndjson")
+
+
+@app.get("/analyses-count")
+async def get_analyses_count():
+    """Approximate total of saved analyses from planner statistics
+
+    Reads pg_class.reltuples instead of COUNT(*), an O(1) catalog
+    lookup rather than a full heap scan. The number is an estimate
+    refreshed by autovacuum/ANALYZE.
+    """
     try:
-        # Get user from token
-        user_data = get_user_from_token(user.credentials)
-        if not user_data:
-            raise HTTPException(status_code=401, detail="Invalid token")
-
-        conn = get_db_connection()
-        cursor = conn.cursor()
-
-        cursor.execute("""
-            SELECT id, user_id, text, result, title, created_at
-            FROM analyses
-            WHERE user_id = %s
-            ORDER BY created_at DESC
-        """, (user_data['id'],))
-
-        analyses = cursor.fetchall()
-        cursor.close()
-        conn.close()
-
-        return [
-            SavedAnalysis(
-                id=analysis['id'],
-                user_id=analysis['user_id'],
-                text=analysis['text'],
-                result=analysis['result'],
-                title=analysis['title'],
-                created_at=analysis['created_at'].isoformat(
-                ) if analysis['created_at'] else None
-            )
-            for analysis in analyses
-        ]
+        async with db_pool.acquire() as conn:
+            estimate = await conn.fetchval(
+                "SELECT reltuples::bigint FROM pg_class WHERE relname = 'analyses'")
 
+        # reltuples is -1 for tables that have never been analyzed
+        return {"approximate_count": max(int(estimate or 0), 0), "exact": False}
     except Exception as e:
-        logger.error(f"Get saved analyses error: {e}")
+        logger.error(f"Analyses count error: {e}")
         raise HTTPException(
-            status_code=500, detail="Database connection failed - retrieval unavailable")
+            status_code=500, detail="Database connection failed - count unavailable")
 
 
 @app.delete("/delete-analysis/{analysis_id}", response_model=AuthResponse)
 async def delete_analysis(analysis_id: int, user: HTTPAuthorizationCredentials = Depends(security)):
     """Delete a saved analysis"""
     try:
-        # Get user from token
-        user_data = get_user_from_token(user.credentials)
-        if not user_data:
-            return AuthResponse(success=False, message="Invalid token")
-
-        conn = get_db_connection()
-        cursor = conn.cursor()
-
-        # Check if analysis belongs to user
-        cursor.execute("""
-            SELECT id FROM analyses 
-            WHERE id = %s AND user_id = %s
-        """, (analysis_id, user_data['id']))
-
-        if not cursor.fetchone():
-            cursor.close()
-            conn.close()
+        async with db_pool.acquire() as conn:
+            # Token lookup, ownership check and delete on one connection;
+            # the ownership check is folded into the DELETE itself
+            user_data = await get_user_from_token(user.credentials, conn)
+            if not user_data:
+                return AuthResponse(success=False, message="Invalid token")
+
+            deleted = await conn.fetchval("""
+                DELETE FROM analyses
+                WHERE id = $1 AND user_id = $2
+                RETURNING id
+            """, analysis_id, user_data['id'])
+
+        if deleted is None:
             return AuthResponse(success=False, message="Analysis not found or not owned by user")
 
-        # Delete the analysis
-        cursor.execute("DELETE FROM analyses WHERE id = %s", (analysis_id,))
-        conn.commit()
-        cursor.close()
-        conn.close()
-
         return AuthResponse(success=True, message="Analysis deleted successfully")
 
     except Exception as e:
@@ -659,4 +1116,13 @@ async def delete_analysis(analysis_id: int, user: HTTPAuthorizationCredentials =
 
 if __name__ == "__main__":
     import uvicorn
-    uvicorn.run(app, host="0.0.0.0", port=8000)
+    # uvloop/httptools come with uvicorn[standard]; one worker per core.
+    # start_api.sh keeps a single --reload worker for development.
+    uvicorn.run(
+        "hate_speech_api:app",
+        host="0.0.0.0",
+        port=8000,
+        workers=os.cpu_count() or 1,
+        loop="uvloop",
+        http="httptools"
+    )
@@ -1,9 +1,13 @@
 import anthropic
-import json
+import asyncio
+import difflib
+import httpx
+import orjson
 import logging
 import re
+from collections import OrderedDict
 from typing import List, Dict, Any, Optional
-from pydantic import BaseModel
+from pydantic import BaseModel, TypeAdapter
 import os
 from dotenv import load_dotenv
 
@@ -13,47 +17,21 @@ load_dotenv()
 # Setup logging
 logger = logging.getLogger(__name__)
 
+# Inputs longer than this are split on paragraph boundaries and analyzed
+# with concurrent Claude calls instead of one large sequential request
+MAX_CHUNK_CHARS = 6000
 
-class BiasSpan(BaseModel):
-    text: str
-    category: str
-    explanation: str
-    suggested_revision: str
-    start_index: int
-    end_index: int
-
-
-class BiasAnalysisResponse(BaseModel):
-    original_text: str
-    bias_spans: List[BiasSpan]
-    summary: Dict[str, Any]
+# Completed analyses cached per input so retries and re-opened tabs skip
+# the Claude round-trip entirely
+ANALYSIS_CACHE_MAX = 256
 
+# Word matcher used by the span-location fallbacks, compiled once
+_WORD_RE = re.compile(r'\w+')
 
-class LLMBiasAnalyzer:
-    def __init__(self):
-        self.client = anthropic.Anthropic(
-            api_key=os.getenv("ANTHROPIC_API_KEY"))
-        # Using the latest Claude 3.5 Sonnet model
-        self.model = "claude-sonnet-4-20250514"
-
-        # Define bias categories for validation
-        self.bias_categories = [
-            "Race / Ethnicity",
-            "Gender / Gender Identity",
-            "Age",
-            "Religion / Belief System",
-            "Sexual Orientation",
-            "Socioeconomic Status",
-            "Nationality / Immigration Status",
-            "Disability",
-            "Education Level",
-            "Political Ideology",
-            "Physical Appearance"
-        ]
 
-    def get_analysis_prompt(self, text: str) -> str:
-        """Generate the structured prompt for bias analysis"""
-        return f"""You are a highly perceptive bias-detection assistant. Your task is to scan the input text for any instances of bias—whether overt or nuanced—and to categorize each instance according to the definitions below.
+# The analysis prompt is constant apart from the input text; build the
+# fixed preamble and suffix once instead of formatting ~2KB per call
+_ANALYSIS_PROMPT_PREFIX = """You are a highly perceptive bias-detection assistant. Your task is to scan the input text for any instances of bias—whether overt or nuanced—and to categorize each instance according to the definitions below.
 
 **Bias Categories & Definitions**
 
@@ -102,7 +80,9 @@ class LLMBiasAnalyzer:
     _E.g._ "Big-boned" to soften a weight comment.
 
 **Input Text to Analyze:**
-{text}
+"""
+
+_ANALYSIS_PROMPT_SUFFIX = """
 
 **CRITICAL INSTRUCTIONS:**
 
@@ -122,21 +102,100 @@ class LLMBiasAnalyzer:
 **Instructions:**
 Please analyze the text and return your findings in the following JSON format. If no bias is detected, return an empty array for "bias_instances".
 
-{{
+{
   "bias_instances": [
-    {{
+    {
       "text_span": "exact words or phrase from the input",
+      "start_index": 123,
+      "end_index": 145,
       "category": "one of the 11 categories listed above",
       "explanation": "why this span is biased and what assumption or stereotype it reflects",
       "suggested_revision": "a neutral or inclusive way to rephrase it"
-    }}
+    }
   ]
-}}
+}
+
+start_index and end_index are 0-based character offsets into the Input Text such that text[start_index:end_index] == text_span exactly.
 
 Return ONLY the JSON response, no additional text or formatting."""
 
-    async def analyze_text(self, text: str) -> BiasAnalysisResponse:
-        """Analyze text for bias using Claude"""
+
+class BiasSpan(BaseModel):
+    text: str
+    category: str
+    explanation: str
+    suggested_revision: str
+    start_index: int
+    end_index: int
+
+
+class BiasAnalysisResponse(BaseModel):
+    original_text: str
+    bias_spans: List[BiasSpan]
+    summary: Dict[str, Any]
+
+
+# Batch validator so a parsed response crosses the Pydantic boundary
+# once, not once per span
+_BIAS_SPAN_LIST = TypeAdapter(List[BiasSpan])
+
+
+class LLMBiasAnalyzer:
+    def __init__(self, http_client: Optional[httpx.AsyncClient] = None):
+        # One keep-alive connection pool shared by every Claude call, so
+        # requests reuse warm TLS connections instead of handshaking
+        # each time
+        self._http_client = http_client or httpx.AsyncClient(
+            limits=httpx.Limits(
+                max_keepalive_connections=100,
+                max_connections=200,
+                keepalive_expiry=60.0
+            ),
+            # Fail fast on connect problems instead of eating into the
+            # generation budget
+            timeout=httpx.Timeout(60.0, connect=5.0),
+            # Transport-level retries cover dropped/stale connections
+            transport=httpx.AsyncHTTPTransport(retries=2)
+        )
+        # The SDK retries rate-limit and overload responses itself with
+        # exponential backoff
+        self.client = anthropic.AsyncAnthropic(
+            api_key=os.getenv("ANTHROPIC_API_KEY"),
+            http_client=self._http_client,
+            max_retries=3)
+        # LRU of text -> BiasAnalysisResponse; results are deterministic
+        # enough at low temperature that reuse beats a repeat API call
+        self._analysis_cache: OrderedDict = OrderedDict()
+        # Using the latest Claude 3.5 Sonnet model
+        self.model = "claude-sonnet-4-20250514"
+
+        # Define bias categories for validation
+        self.bias_categories = [
+            "Race / Ethnicity",
+            "Gender / Gender Identity",
+            "Age",
+            "Religion / Belief System",
+            "Sexual Orientation",
+            "Socioeconomic Status",
+            "Nationality / Immigration Status",
+            "Disability",
+            "Education Level",
+            "Political Ideology",
+            "Physical Appearance"
+        ]
+        # Frozen set for O(1) category validation per span
+        self._category_set = frozenset(self.bias_categories)
+
+    def get_analysis_prompt(self, text: str) -> str:
+        """Generate the structured prompt for bias analysis"""
+        return _ANALYSIS_PROMPT_PREFIX + text + _ANALYSIS_PROMPT_SUFFIX
+
+    async def analyze_text(self, text: str, temperature: Optional[float] = None) -> BiasAnalysisResponse:
+        """Analyze text for bias using Claude
+
+        Temperature is passed per call rather than stored on the
+        analyzer, so concurrent requests can't race on shared state.
+        """
         try:
             if not text.strip():
                 return BiasAnalysisResponse(
@@ -150,41 +209,144 @@ Return ONLY the JSON response, no additional text or formatting."""
                     }
                 )
 
-            # Make API call to Claude
-            response = await self._make_claude_request(text)
+            cached = self._analysis_cache.get(text)
+            if cached is not None:
+                self._analysis_cache.move_to_end(text)
+                return cached
+
+            # Long inputs are chunked and analyzed concurrently; span
+            # indices come back chunk-relative and are shifted by each
+            # chunk's offset into the original text
+            chunks = self._split_into_chunks(text)
+            responses = await asyncio.gather(
+                *[self._make_claude_request(chunk, temperature)
+                  for _, chunk in chunks]
+            )
 
-            # Parse the response
-            bias_spans = self._parse_response(response, text)
+            bias_spans = []
+            for (offset, chunk), response in zip(chunks, responses):
+                # Span location is CPU-heavy Python work; keep it off
+                # the event loop so other requests aren't stalled
+                parsed = await asyncio.to_thread(
+                    self._parse_response, response, chunk)
+                for span in parsed:
+                    span.start_index += offset
+                    span.end_index += offset
+                    bias_spans.append(span)
 
             # Generate summary
             summary = self._generate_summary(bias_spans, text)
 
-            return BiasAnalysisResponse(
+            result = BiasAnalysisResponse(
                 original_text=text,
                 bias_spans=bias_spans,
                 summary=summary
             )
 
+            self._analysis_cache[text] = result
+            if len(self._analysis_cache) > ANALYSIS_CACHE_MAX:
+                self._analysis_cache.popitem(last=False)
+
+            return result
+
         except Exception as e:
             logger.error(f"Error analyzing text with Claude: {e}")
             raise Exception(f"Bias analysis failed: {str(e)}")
 
-    async def _make_claude_request(self, text: str) -> str:
+    async def analyze_text_stream(self, text: str, temperature: Optional[float] = None):
+        """Yield span records as each chunk's analysis completes
+
+        Records are NDJSON-ready dicts: {"type": "span", ...} per bias
+        span, followed by a final {"type": "summary", ...}. All chunk
+        requests dispatch up front, so later chunks analyze while
+        earlier spans are already streaming to the client.
+        """
+        if not text.strip():
+            yield {
+                "type": "summary",
+                "summary": {
+                    "total_bias_instances": 0,
+                    "categories_detected": [],
+                    "overall_assessment": "No bias detected",
+                    "risk_level": "Low"
+                }
+            }
+            return
+
+        chunks = self._split_into_chunks(text)
+        tasks = [
+            asyncio.create_task(self._make_claude_request(chunk, temperature))
+            for _, chunk in chunks
+        ]
+
+        spans = []
+        for (offset, chunk), task in zip(chunks, tasks):
+            response = await task
+            parsed = await asyncio.to_thread(
+                self._parse_response, response, chunk)
+            for span in parsed:
+                span.start_index += offset
+                span.end_index += offset
+                spans.append(span)
+                yield {"type": "span", **span.model_dump()}
+
+        yield {"type": "summary", "summary": self._generate_summary(spans, text)}
+
+    def _split_into_chunks(self, text: str) -> List[tuple[int, str]]:
+        """Split long text into (offset, chunk) pairs for concurrent analysis
+
+        Chunks break on paragraph boundaries where possible, falling back
+        to sentence boundaries and then a hard cut, so bias spans are
+        unlikely to straddle two chunks.
+        """
+        if len(text) <= MAX_CHUNK_CHARS:
+            return [(0, text)]
+
+        chunks = []
+        start = 0
+        while len(text) - start > MAX_CHUNK_CHARS:
+            window_end = start + MAX_CHUNK_CHARS
+            cut = text.rfind('\n\n', start, window_end)
+            if cut <= start:
+                cut = text.rfind('. ', start, window_end)
+                cut = cut + 2 if cut > start else window_end
+            chunks.append((start, text[start:cut]))
+            start = cut
+        chunks.append((start, text[start:]))
+        return chunks
+
+    async def _make_claude_request(self, text: str, temperature: Optional[float] = None) -> str:
         """Make request to Claude API"""
         try:
-            prompt = self.get_analysis_prompt(text)
-
-            response = self.client.messages.create(
+            # The static preamble goes in its own content block marked
+            # for Anthropic prompt caching, so repeat calls only pay
+            # full input-token cost for the text being analyzed
+            content = [
+                {
+                    "type": "text",
+                    "text": _ANALYSIS_PROMPT_PREFIX,
+                    "cache_control": {"type": "ephemeral"}
+                },
+                {
+                    "type": "text",
+                    "text": text + _ANALYSIS_PROMPT_SUFFIX
+                }
+            ]
+
+            # Stream the completion instead of blocking on the full
+            # 2000-token body: tokens accumulate as they arrive, so a
+            # stalled generation fails fast instead of timing out the
+            # whole request at the end
+            async with self.client.messages.stream(
                 model=self.model,
                 max_tokens=2000,
-                temperature=0.3,
+                temperature=temperature if temperature is not None else 0.3,
                 system="You are a bias detection expert. Always return valid JSON as specified in the user's request.",
                 messages=[
-                    {"role": "user", "content": prompt}
+                    {"role": "user", "content": content}
                 ]
-            )
-
-            return response.content[0].text
+            ) as stream:
+                return await stream.get_final_text()
 
         except Exception as e:
             logger.error(f"Claude API error: {e}")
@@ -195,13 +357,18 @@ Return ONLY the JSON response, no additional text or formatting."""
         try:
             # Clean the response to ensure valid JSON
             response = response.strip()
-            if response.startswith('```json'):
-                response = response[7:]
-            if response.endswith('```'):
-                response = response[:-3]
-
-            data = json.loads(response)
-            bias_spans = []
+            response = response.removeprefix('```json').removesuffix('```')
+
+            try:
+                data = orjson.loads(response)
+            except orjson.JSONDecodeError:
+                # Claude occasionally truncates mid-array when it hits
+                # max_tokens; salvage the complete instances instead of
+                # dropping every span
+                data = self._parse_truncated_response(response)
+            span_records = []
+            # Lower the document once; every span lookup reuses it
+            lower_text = original_text.lower()
 
             for instance in data.get('bias_instances', []):
                 text_span = instance.get('text_span', '')
@@ -209,8 +376,15 @@ Return ONLY the JSON response, no additional text or formatting."""
                 explanation = instance.get('explanation', '')
                 suggested_revision = instance.get('suggested_revision', '')
 
-                # Improved text matching with multiple strategies
-                start_index, end_index = self._find_text_span(original_text, text_span)
+                # Trust Claude's own offsets when they check out; only
+                # fall back to the matching strategies when they don't
+                start_index = instance.get('start_index')
+                end_index = instance.get('end_index')
+                if not (isinstance(start_index, int) and isinstance(end_index, int)
+                        and 0 <= start_index < end_index <= len(original_text)
+                        and original_text[start_index:end_index] == text_span):
+                    start_index, end_index = self._find_text_span(
+                        original_text, text_span, lower_text)
                 
                 # Skip if we couldn't find the text at all
                 if start_index == -1:
@@ -218,7 +392,7 @@ Return ONLY the JSON response, no additional text or formatting."""
                     continue
 
                 # Validate category
-                if category not in self.bias_categories:
+                if category not in self._category_set:
                     logger.warning(f"Invalid category detected: {category}")
                     category = "Other"
 
@@ -239,18 +413,20 @@ Return ONLY the JSON response, no additional text or formatting."""
                     text_to_use = text_span
                     logger.info(f"Using LLM's original text for consistency: '{text_to_use}'")
 
-                bias_spans.append(BiasSpan(
-                    text=text_to_use,  # Use LLM's text for tooltip/highlighting consistency
-                    category=category,
-                    explanation=explanation,
-                    suggested_revision=suggested_revision,
-                    start_index=start_index,
-                    end_index=end_index
-                ))
+                span_records.append({
+                    'text': text_to_use,  # Use LLM's text for tooltip/highlighting consistency
+                    'category': category,
+                    'explanation': explanation,
+                    'suggested_revision': suggested_revision,
+                    'start_index': start_index,
+                    'end_index': end_index
+                })
 
-            return bias_spans
+            # Validate the whole batch in one Rust-backed call instead of
+            # crossing the Pydantic boundary once per span
+            return _BIAS_SPAN_LIST.validate_python(span_records)
 
-        except json.JSONDecodeError as e:
+        except orjson.JSONDecodeError as e:
             logger.error(f"Failed to parse JSON response: {e}")
             logger.error(f"Response content: {response}")
             return []
@@ -258,46 +434,71 @@ Return ONLY the JSON response, no additional text or formatting."""
             logger.error(f"Error parsing response: {e}")
             return []
 
-    def _find_text_span(self, original_text: str, text_span: str) -> tuple[int, int]:
-        """Find the best match for a text span in the original text"""
+    def _parse_truncated_response(self, response: str) -> Dict[str, Any]:
+        """Recover the complete bias instances from a truncated response
+
+        Walks back through the candidate object-closing braces and
+        re-closes the bias_instances array at the last point that parses.
+        """
+        cut = response.rfind('}')
+        while cut > 0:
+            try:
+                return orjson.loads(response[:cut + 1] + ']}')
+            except orjson.JSONDecodeError:
+                cut = response.rfind('}', 0, cut)
+        # Nothing salvageable; re-raise the original decode error
+        raise
+
+    def _find_text_span(self, original_text: str, text_span: str,
+                        lower_text: Optional[str] = None) -> tuple[int, int]:
+        """Find the best match for a text span in the original text
+
+        The caller can pass the pre-lowered original text so one document
+        isn't re-lowercased for every span.
+        """
         if not text_span or not original_text:
             return -1, -1
-            
+
+        # Lowercase once up front; the fallback strategies below all
+        # work on the lowered forms
+        if lower_text is None:
+            lower_text = original_text.lower()
+        lower_span = text_span.lower()
+
         # Strategy 1: Exact case-sensitive match
         start_index = original_text.find(text_span)
         if start_index != -1:
             return start_index, start_index + len(text_span)
-        
+
         # Strategy 2: Case-insensitive match
-        start_index = original_text.lower().find(text_span.lower())
+        start_index = lower_text.find(lower_span)
         if start_index != -1:
             return start_index, start_index + len(text_span)
-        
+
         # Strategy 3: Look for individual words from the span
-        span_words = re.findall(r'\w+', text_span.lower())
+        span_words = _WORD_RE.findall(lower_span)
         if not span_words:
             return -1, -1
-            
+
         # Find the first word of the span
         first_word = span_words[0]
-        text_words = re.findall(r'\w+', original_text.lower())
-        
+        text_words = _WORD_RE.findall(lower_text)
+
         try:
             first_word_index = text_words.index(first_word)
             # Calculate character position
             word_starts = []
-            word_pattern = re.compile(r'\w+')
-            for match in word_pattern.finditer(original_text.lower()):
+            for match in _WORD_RE.finditer(lower_text):
                 word_starts.append(match.start())
-            
+
             if first_word_index < len(word_starts):
                 start_char = word_starts[first_word_index]
-                
+
                 # Try to find the end by looking for the last word
                 if len(span_words) > 1:
                     last_word = span_words[-1]
                     # Look for last word after first word position
-                    remaining_text = original_text.lower()[start_char:]
+                    remaining_text = lower_text[start_char:]
                     last_word_pos = remaining_text.find(last_word)
                     if last_word_pos != -1:
                         end_char = start_char + last_word_pos + len(last_word)
@@ -309,41 +510,23 @@ Return ONLY the JSON response, no additional text or formatting."""
         except (ValueError, IndexError):
             pass
         
-        # Strategy 4: Fuzzy matching - find longest common substring
-        def longest_common_substring(s1: str, s2: str) -> tuple[int, int, int]:
-            """Find longest common substring, return (start_in_s1, start_in_s2, length)"""
-            s1_lower = s1.lower()
-            s2_lower = s2.lower()
-            longest_length = 0
-            best_s1_start = 0
-            best_s2_start = 0
-            
-            for i in range(len(s1_lower)):
-                for j in range(len(s2_lower)):
-                    length = 0
-                    while (i + length < len(s1_lower) and 
-                           j + length < len(s2_lower) and 
-                           s1_lower[i + length] == s2_lower[j + length]):
-                        length += 1
-                    
-                    if length > longest_length:
-                        longest_length = length
-                        best_s1_start = i
-                        best_s2_start = j
-            
-            return best_s1_start, best_s2_start, longest_length
-        
-        s1_start, s2_start, length = longest_common_substring(original_text, text_span)
-        if length >= min(4, len(text_span) // 2):  # At least 4 chars or half the span
-            return s1_start, s1_start + length
-        
+        # Strategy 4: Fuzzy matching - find longest common substring via
+        # difflib's C-implemented matcher (autojunk off: long texts make
+        # the popularity heuristic discard real matches)
+        matcher = difflib.SequenceMatcher(None, lower_text, lower_span, autojunk=False)
+        match = matcher.find_longest_match(0, len(lower_text), 0, len(lower_span))
+        if match.size >= min(4, len(text_span) // 2):  # At least 4 chars or half the span
+            return match.a, match.a + match.size
+
         # If all strategies fail, don't create the span
         return -1, -1
 
     def _generate_summary(self, bias_spans: List[BiasSpan], text: str) -> Dict[str, Any]:
         """Generate summary statistics"""
         total_bias_instances = len(bias_spans)
-        categories_detected = list(set(span.category for span in bias_spans))
+        # dict.fromkeys dedupes in one pass and keeps first-seen order,
+        # so repeated analyses serialize identically
+        categories_detected = list(dict.fromkeys(span.category for span in bias_spans))
 
         # Calculate risk level
         if total_bias_instances == 0:
@@ -356,11 +539,15 @@ Return ONLY the JSON response, no additional text or formatting."""
             risk_level = "High"
             overall_assessment = f"Multiple bias instances detected ({total_bias_instances} instances)"
 
+        # Space-count word estimate; text.split() would allocate a list
+        # of every token just to take its length
+        word_count = text.count(' ') + 1 if text else 0
+
         return {
             "total_bias_instances": total_bias_instances,
             "categories_detected": categories_detected,
             "overall_assessment": overall_assessment,
             "risk_level": risk_level,
             "text_length": len(text),
-            "bias_density": total_bias_instances / max(len(text.split()), 1)
+            "bias_density": total_bias_instances / max(word_count, 1)
         }
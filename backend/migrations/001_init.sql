@@ -0,0 +1,32 @@
+-- Initial schema: users, analyses and their indexes.
+-- Statements are idempotent so re-applying on startup is safe.
+
+CREATE TABLE IF NOT EXISTS users (
+    id SERIAL PRIMARY KEY,
+    email VARCHAR(255) UNIQUE NOT NULL,
+    name VARCHAR(255) NOT NULL,
+    password_hash VARCHAR(255) NOT NULL,
+    token VARCHAR(255),
+    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+);
+
+-- Token lookup runs on every authenticated request; without this index
+-- it's a seq-scan over users
+CREATE UNIQUE INDEX IF NOT EXISTS idx_users_token ON users (token);
+
+CREATE TABLE IF NOT EXISTS analyses (
+    id SERIAL PRIMARY KEY,
+    user_id INTEGER REFERENCES users(id) ON DELETE CASCADE,
+    text TEXT NOT NULL,
+    result JSONB NOT NULL,
+    title VARCHAR(255),
+    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+);
+
+-- jsonb_path_ops GIN index for containment queries on result, and a
+-- composite index matching the user_id filter + created_at DESC sort of
+-- the history endpoint
+CREATE INDEX IF NOT EXISTS idx_analyses_result_gin
+    ON analyses USING GIN (result jsonb_path_ops);
+CREATE INDEX IF NOT EXISTS idx_analyses_user_created
+    ON analyses (user_id, created_at DESC);
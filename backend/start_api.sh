@@ -20,10 +20,6 @@ source ../.venv/bin/activate
 echo "📦 Checking dependencies..."
 pip install -r requirements.txt --quiet
 
-# Download NLTK data if needed
-echo "📚 Downloading NLTK data..."
-python -c "import nltk; nltk.download('punkt', quiet=True)"
-
 # Start the API server
 echo "🌐 Starting FastAPI server on http://localhost:8000"
 echo "📖 API documentation will be available at http://localhost:8000/docs"
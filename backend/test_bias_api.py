@@ -4,24 +4,27 @@ Test script for the Bias Detection API
 Tests the new Claude-powered bias detection functionality
 """
 
-import requests
-import json
+import orjson
 import os
-from dotenv import load_dotenv
-
-# Load environment variables
-load_dotenv()
+import sys
+from concurrent.futures import ThreadPoolExecutor
 
 API_BASE_URL = "http://localhost:8000"
+JSON_HEADERS = {"Content-Type": "application/json"}
+
+
+def _post_json(session, url, payload):
+    """POST an orjson-serialized body instead of stdlib json= encoding"""
+    return session.post(url, data=orjson.dumps(payload), headers=JSON_HEADERS)
 
 
-def test_health_check():
+def test_health_check(session):
     """Test the health check endpoint"""
     try:
-        response = requests.get(f"{API_BASE_URL}/")
+        response = session.get(f"{API_BASE_URL}/")
         print(f"Health Check: {response.status_code}")
         if response.status_code == 200:
-            data = response.json()
+            data = orjson.loads(response.content)
             print(f"✅ API Status: {data.get('status')}")
             print(f"✅ Analyzer Loaded: {data.get('analyzer_loaded')}")
             return True
@@ -33,82 +36,135 @@ def test_health_check():
         return False
 
 
-def test_bias_detection():
+TEST_CASES = (
+    {
+        "name": "No bias - neutral text",
+        "text": "The meeting was productive and everyone contributed valuable insights.",
+        "expected_bias": False
+    },
+    {
+        "name": "Gender bias",
+        "text": "She's being too emotional about this business decision. We need someone more rational.",
+        "expected_bias": True
+    },
+    {
+        "name": "Age bias",
+        "text": "The old guy probably doesn't understand modern technology anyway.",
+        "expected_bias": True
+    },
+    {
+        "name": "Mixed content",
+        "text": "The team performed well. However, the female manager seemed overly aggressive in her presentation style.",
+        "expected_bias": True
+    }
+)
+
+# The cases are literal constants, so URLs and request bodies can be
+# formatted/serialized once at import instead of per run
+ANALYZE_URL = f"{API_BASE_URL}/analyze"
+BATCH_URL = f"{API_BASE_URL}/analyze-batch"
+BATCH_BODY = orjson.dumps([{"text": tc['text']} for tc in TEST_CASES])
+CASE_BODIES = tuple(orjson.dumps({"text": tc['text']}) for tc in TEST_CASES)
+
+
+def test_bias_detection(session):
     """Test the bias detection functionality"""
-    test_cases = [
-        {
-            "name": "No bias - neutral text",
-            "text": "The meeting was productive and everyone contributed valuable insights.",
-            "expected_bias": False
-        },
-        {
-            "name": "Gender bias",
-            "text": "She's being too emotional about this business decision. We need someone more rational.",
-            "expected_bias": True
-        },
-        {
-            "name": "Age bias",
-            "text": "The old guy probably doesn't understand modern technology anyway.",
-            "expected_bias": True
-        },
-        {
-            "name": "Mixed content",
-            "text": "The team performed well. However, the female manager seemed overly aggressive in her presentation style.",
-            "expected_bias": True
-        }
-    ]
-
     print("\n🔬 Testing Bias Detection with Claude")
     print("=" * 50)
 
-    for test_case in test_cases:
-        print(f"\nTest: {test_case['name']}")
-        print(f"Text: {test_case['text']}")
+    # One POST covers every case; servers without /analyze-batch get the
+    # concurrent per-case fallback
+    try:
+        response = session.post(BATCH_URL, data=BATCH_BODY, headers=JSON_HEADERS)
+    except Exception as e:
+        print(f"❌ Test error: {e}")
+        return
+
+    if response.status_code == 404:
+        _run_bias_cases_concurrently(session)
+        return
+
+    if response.status_code != 200:
+        print(f"❌ Batch request failed: {response.status_code}")
+        return
 
+    for test_case, result in zip(TEST_CASES, orjson.loads(response.content)):
+        print(_format_bias_case(test_case, result))
+
+
+def _run_bias_cases_concurrently(session):
+    """Per-case /analyze fallback, run concurrently"""
+    with ThreadPoolExecutor(max_workers=len(TEST_CASES)) as executor:
+        futures = [
+            executor.submit(_run_bias_case, session, test_case, body)
+            for test_case, body in zip(TEST_CASES, CASE_BODIES)
+        ]
+        for future in futures:
+            print(future.result())
+
+
+def _run_bias_case(session, test_case, body):
+    """Run one bias test case and return its buffered output"""
+    try:
+        response = session.post(ANALYZE_URL, data=body, headers=JSON_HEADERS)
+
+        if response.status_code == 200:
+            return _format_bias_case(test_case, orjson.loads(response.content))
+
+        lines = [f"\nTest: {test_case['name']}",
+                 f"Text: {test_case['text']}",
+                 f"❌ Request failed: {response.status_code}"]
+        # Read the bytes once; response.text would re-run encoding
+        # detection on the same body
+        raw = response.content
         try:
-            payload = {"text": test_case['text']}
-            response = requests.post(f"{API_BASE_URL}/analyze", json=payload)
+            error_data = orjson.loads(raw)
+            lines.append(f"Error: {error_data.get('detail', 'Unknown error')}")
+        except orjson.JSONDecodeError:
+            lines.append(f"Raw response: {raw.decode('utf-8', 'replace')}")
+    except Exception as e:
+        lines = [f"\nTest: {test_case['name']}", f"❌ Test error: {e}"]
+
+    lines.append("-" * 30)
+    return "\n".join(lines)
+
 
-            if response.status_code == 200:
-                result = response.json()
-                bias_found = len(result['bias_spans']) > 0
+def _format_bias_case(test_case, result):
+    """Format one case's analysis result as the familiar report block"""
+    lines = [f"\nTest: {test_case['name']}", f"Text: {test_case['text']}"]
 
-                print(f"Status: ✅ Success")
-                print(f"Bias detected: {bias_found}")
-                print(f"Number of bias spans: {len(result['bias_spans'])}")
+    if 'error' in result:
+        lines.append(f"❌ Analysis failed: {result['error']}")
+        lines.append("-" * 30)
+        return "\n".join(lines)
 
-                if result['bias_spans']:
-                    print("Detected bias spans:")
-                    for span in result['bias_spans']:
-                        print(f"  - '{span['text']}' ({span['category']})")
-                        print(f"    Explanation: {span['explanation']}")
-                        print(f"    Suggested: {span['suggested_revision']}")
+    bias_found = len(result['bias_spans']) > 0
 
-                print(f"Summary: {result['summary']['overall_assessment']}")
-                print(f"Risk Level: {result['summary']['risk_level']}")
+    lines.append(f"Status: ✅ Success")
+    lines.append(f"Bias detected: {bias_found}")
+    lines.append(f"Number of bias spans: {len(result['bias_spans'])}")
 
-                # Verify expectation
-                if bias_found == test_case['expected_bias']:
-                    print("✅ Result matches expectation")
-                else:
-                    print("⚠️  Result doesn't match expectation")
+    if result['bias_spans']:
+        lines.append("Detected bias spans:")
+        for span in result['bias_spans']:
+            lines.append(f"  - '{span['text']}' ({span['category']})")
+            lines.append(f"    Explanation: {span['explanation']}")
+            lines.append(f"    Suggested: {span['suggested_revision']}")
 
-            else:
-                print(f"❌ Request failed: {response.status_code}")
-                try:
-                    error_data = response.json()
-                    print(
-                        f"Error: {error_data.get('detail', 'Unknown error')}")
-                except:
-                    print(f"Raw response: {response.text}")
+    lines.append(f"Summary: {result['summary']['overall_assessment']}")
+    lines.append(f"Risk Level: {result['summary']['risk_level']}")
 
-        except Exception as e:
-            print(f"❌ Test error: {e}")
+    # Verify expectation
+    if bias_found == test_case['expected_bias']:
+        lines.append("✅ Result matches expectation")
+    else:
+        lines.append("⚠️  Result doesn't match expectation")
 
-        print("-" * 30)
+    lines.append("-" * 30)
+    return "\n".join(lines)
 
 
-def test_simple_endpoint():
+def test_simple_endpoint(session):
     """Test the simplified endpoint"""
     print("\n🔬 Testing Simple Endpoint")
     print("=" * 50)
@@ -117,11 +173,11 @@ def test_simple_endpoint():
 
     try:
         payload = {"text": text}
-        response = requests.post(
-            f"{API_BASE_URL}/analyze-simple", json=payload)
+        response = _post_json(
+            session, f"{API_BASE_URL}/analyze-simple", payload)
 
         if response.status_code == 200:
-            result = response.json()
+            result = orjson.loads(response.content)
             print(f"✅ Simple endpoint works")
             print(f"Bias detected: {result.get('bias_detected', False)}")
             print(f"Number of spans: {len(result.get('bias_spans', []))}")
@@ -132,8 +188,76 @@ def test_simple_endpoint():
         print(f"❌ Simple endpoint error: {e}")
 
 
+def test_streaming_endpoint(session):
+    """Test the NDJSON streaming endpoint"""
+    print("\n🔬 Testing Streaming Endpoint")
+    print("=" * 50)
+
+    text = "She's being too emotional about this business decision. The old guy probably doesn't understand modern technology anyway."
+
+    try:
+        # stream=True + iter_lines prints each span record as it
+        # arrives instead of waiting for the full analysis
+        with session.post(f"{API_BASE_URL}/analyze-stream",
+                          data=orjson.dumps({"text": text}),
+                          headers=JSON_HEADERS, stream=True) as response:
+            if response.status_code == 404:
+                print("ℹ️  /analyze-stream not available on this server")
+                return
+            if response.status_code != 200:
+                print(f"❌ Streaming endpoint failed: {response.status_code}")
+                return
+
+            print("✅ Streaming endpoint works")
+            for line in response.iter_lines():
+                if not line:
+                    continue
+                record = orjson.loads(line)
+                if record.get('type') == 'span':
+                    print(f"  span: '{record['text']}' ({record['category']})")
+                elif record.get('type') == 'summary':
+                    print(f"  summary: {record['summary']['overall_assessment']}")
+
+    except Exception as e:
+        print(f"❌ Streaming endpoint error: {e}")
+
+
+def run_soak(session, iterations=200, concurrency=32):
+    """Hammer /analyze with bounded concurrency and report tail latency"""
+    import statistics
+    import time
+
+    bodies = [CASE_BODIES[i % len(CASE_BODIES)] for i in range(iterations)]
+
+    def one_request(body):
+        start = time.perf_counter()
+        session.post(ANALYZE_URL, data=body, headers=JSON_HEADERS)
+        return time.perf_counter() - start
+
+    print(f"\n🔬 Soak: {iterations} requests, concurrency {concurrency}")
+    print("=" * 50)
+
+    # max_workers bounds the in-flight requests the way a semaphore would
+    with ThreadPoolExecutor(max_workers=concurrency) as executor:
+        latencies = list(executor.map(one_request, bodies))
+
+    quantiles = statistics.quantiles(latencies, n=100)
+    print(f"p50: {quantiles[49] * 1000:.1f} ms")
+    print(f"p90: {quantiles[89] * 1000:.1f} ms")
+    print(f"p99: {quantiles[98] * 1000:.1f} ms")
+
+
 def main():
     """Run all tests"""
+    # Deferred so the cold-start cost of requests/urllib3 and the .env
+    # read isn't paid until the suite actually runs
+    import requests
+    from dotenv import load_dotenv
+    from requests.adapters import HTTPAdapter
+    from urllib3.util.retry import Retry
+
+    load_dotenv()
+
     print("🧪 Claude-Powered Bias Detection API Test Suite")
     print("=" * 60)
 
@@ -143,16 +267,35 @@ def main():
         print("Please set your Anthropic API key in the .env file")
         return
 
-    # Test health check first
-    if not test_health_check():
-        print("❌ Health check failed, cannot proceed with tests")
-        return
-
-    # Test bias detection
-    test_bias_detection()
-
-    # Test simple endpoint
-    test_simple_endpoint()
+    # One session for the whole suite so every request reuses the same
+    # kept-alive connection instead of handshaking per call
+    session = requests.Session()
+    session.mount("http://", HTTPAdapter(
+        pool_connections=4,
+        pool_maxsize=16,
+        max_retries=Retry(total=2, backoff_factor=0.1)
+    ))
+
+    with session:
+        # Fire the health check alongside the bias batch instead of
+        # spending a serial round-trip before any real work starts; it
+        # resolves in milliseconds while the analyses run
+        with ThreadPoolExecutor(max_workers=1) as executor:
+            health_future = executor.submit(test_health_check, session)
+            test_bias_detection(session)
+            if not health_future.result():
+                print("❌ Health check failed, skipping remaining tests")
+                return
+
+        # Test simple endpoint
+        test_simple_endpoint(session)
+
+        # Test streaming endpoint
+        test_streaming_endpoint(session)
+
+        # Optional tail-latency soak, kept off the default fast path
+        if "--soak" in sys.argv:
+            run_soak(session)
 
     print("\n✨ Test suite completed!")
 
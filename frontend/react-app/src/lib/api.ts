@@ -193,14 +193,27 @@ export async function saveAnalysis(
 
 /**
  * Get saved analyses for the authenticated user
+ * @param limit - Maximum number of analyses to fetch (default 50)
+ * @param before - created_at of the last received row, for the next page
  * @returns Promise<SavedAnalysis[]> - Array of saved analyses
  */
-export async function getSavedAnalyses(): Promise<SavedAnalysis[]> {
+export async function getSavedAnalyses(
+  limit: number = 50,
+  before?: string
+): Promise<SavedAnalysis[]> {
   try {
-    const response = await fetch(`${API_BASE_URL}/saved-analyses`, {
-      method: "GET",
-      headers: createAuthHeaders(),
-    });
+    const params = new URLSearchParams({ limit: String(limit) });
+    if (before) {
+      params.set("before", before);
+    }
+
+    const response = await fetch(
+      `${API_BASE_URL}/saved-analyses?${params.toString()}`,
+      {
+        method: "GET",
+        headers: createAuthHeaders(),
+      }
+    );
 
     if (!response.ok) {
       const errorData = await response.json().catch(() => ({}));
@@ -209,7 +222,12 @@ export async function getSavedAnalyses(): Promise<SavedAnalysis[]> {
       );
     }
 
-    return await response.json();
+    // The endpoint streams NDJSON: one JSON object per line
+    const body = await response.text();
+    return body
+      .split("\n")
+      .filter((line) => line.length > 0)
+      .map((line) => JSON.parse(line));
   } catch (error) {
     console.error("Error getting saved analyses:", error);
     return [];